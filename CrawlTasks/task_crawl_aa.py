@@ -1,41 +1,28 @@
-from functools import partial
+from types import MappingProxyType
 
-import Scraper.PlaywrightRenderedScraper
 from GlobalConfig import APPLIED_NATIONAL_TIMEOUT_MS
-from MyPythonUtility.easy_config import EasyConfig
-from ServiceEngine import ServiceContext
-from Tools.RSSFetcher import fetch_feed
-from Scraper.PlaywrightRenderedScraper import fetch_content
-from Scrubber.HTMLConvertor import html_content_converter
-from Scrubber.UnicodeSanitizer import sanitize_unicode_string
-from Workflow.CommonFeedsCrawFlow import feeds_craw_flow
+from Workflow.CommonFeedsCrawTask import FeedsCrawTask
 
 # https://www.aa.com.tr/
 
-feed_list = {
+feed_list = MappingProxyType({
     "Default": "https://www.aa.com.tr/tr/rss"
-}
+})
 
 
-config: EasyConfig | None = None
+task = FeedsCrawTask('aa',
+                     feed_list,
+                     feed_scraper='Scraper.PlaywrightRenderedScraper',
+                     content_scraper='Scraper.PlaywrightRenderedScraper',
+                     timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS,
+                     content_format='lxml',
+                     selectors=['div[class="detay-icerik"]'],
+                     max_length=10240 * 5)
 
 
-def module_init(service_context: ServiceContext):
-    global config
-    config = service_context.config
+def module_init(service_context):
+    task.module_init(service_context)
 
 
 def start_task(stop_event):
-    feeds_craw_flow('aa',
-                    feed_list,
-                    stop_event,
-                    config,
-                    15 * 60,
-
-                    partial(fetch_feed, scraper=Scraper.PlaywrightRenderedScraper, proxy=config.get('collector.global_site_proxy', {})),
-                    partial(fetch_content, timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS, proxy=config.get('collector.global_site_proxy', {}), format='lxml'),
-                    [
-                        partial(html_content_converter, selectors=['div[class="detay-icerik"]']),
-                        partial(sanitize_unicode_string, max_length=10240 * 5)
-                    ])
-
+    task.start_task(stop_event)
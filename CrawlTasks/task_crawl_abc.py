@@ -1,44 +1,31 @@
-from functools import partial
+from types import MappingProxyType
 
-import Scraper.PlaywrightRawScraper
 from GlobalConfig import APPLIED_NATIONAL_TIMEOUT_MS
-from MyPythonUtility.easy_config import EasyConfig
-from ServiceEngine import ServiceContext
-from Tools.RSSFetcher import fetch_feed
-from Scraper.RequestsScraper import fetch_content
-from Scrubber.HTMLConvertor import html_content_converter
-from Scrubber.UnicodeSanitizer import sanitize_unicode_string
-from Workflow.CommonFeedsCrawFlow import feeds_craw_flow
+from Workflow.CommonFeedsCrawTask import FeedsCrawTask
 
 # https://www.abc.net.au/
 
-feed_list = {
+feed_list = MappingProxyType({
     "Top Stories": "https://www.abc.net.au/news/feed/10719986/rss.xml",
     "World": "https://www.abc.net.au/news/feed/104217382/rss.xml",
     "Business": "https://www.abc.net.au/news/feed/104217374/rss.xml",
     "Politics": "https://www.abc.net.au/news/feed/104217372/rss.xml",
-}
+})
 
 
-config: EasyConfig | None = None
+task = FeedsCrawTask('abc',
+                     feed_list,
+                     feed_scraper='Scraper.PlaywrightRawScraper',
+                     content_scraper='Scraper.RequestsScraper',
+                     timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS,
+                     content_format='lxml',
+                     selectors=['div[class*="ArticleHeadlineTitle_container"]', 'div[class*="ArticleWeb_article"]'],
+                     max_length=10240 * 5)
 
 
-def module_init(service_context: ServiceContext):
-    global config
-    config = service_context.config
+def module_init(service_context):
+    task.module_init(service_context)
 
 
 def start_task(stop_event):
-    feeds_craw_flow('abc',
-                    feed_list,
-                    stop_event,
-                    config,
-                    15 * 60,
-
-                    partial(fetch_feed, scraper=Scraper.PlaywrightRawScraper, proxy=config.get('collector.global_site_proxy', {})),
-                    partial(fetch_content, timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS, proxy=config.get('collector.global_site_proxy', {}), format='lxml'),
-                    [
-                        partial(html_content_converter, selectors=['div[class*="ArticleHeadlineTitle_container"]', 'div[class*="ArticleWeb_article"]']),
-                        partial(sanitize_unicode_string, max_length=10240 * 5)
-                    ])
-
+    task.start_task(stop_event)
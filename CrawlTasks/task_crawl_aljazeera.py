@@ -1,41 +1,28 @@
-from functools import partial
+from types import MappingProxyType
 
-import Scraper.RequestsScraper
 from GlobalConfig import APPLIED_NATIONAL_TIMEOUT_MS
-from MyPythonUtility.easy_config import EasyConfig
-from ServiceEngine import ServiceContext
-from Tools.RSSFetcher import fetch_feed
-from Scraper.RequestsScraper import fetch_content
-from Scrubber.HTMLConvertor import html_content_converter
-from Scrubber.UnicodeSanitizer import sanitize_unicode_string
-from Workflow.CommonFeedsCrawFlow import feeds_craw_flow
+from Workflow.CommonFeedsCrawTask import FeedsCrawTask
 
 # https://www.aljazeera.com/
 
-feed_list = {
+feed_list = MappingProxyType({
     "All": "https://www.aljazeera.com/xml/rss/all.xml",
-}
+})
 
 
-config: EasyConfig | None = None
+task = FeedsCrawTask('aljazeera',
+                     feed_list,
+                     feed_scraper='Scraper.RequestsScraper',
+                     content_scraper='Scraper.RequestsScraper',
+                     timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS,
+                     content_format='lxml',
+                     selectors='main#main-content-area',
+                     max_length=10240 * 5)
 
 
-def module_init(service_context: ServiceContext):
-    global config
-    config = service_context.config
+def module_init(service_context):
+    task.module_init(service_context)
 
 
 def start_task(stop_event):
-    feeds_craw_flow('aljazeera',
-                    feed_list,
-                    stop_event,
-                    config,
-                    15 * 60,
-
-                    partial(fetch_feed, scraper=Scraper.RequestsScraper, proxy=config.get('collector.global_site_proxy', {})),
-                    partial(fetch_content, timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS, proxy=config.get('collector.global_site_proxy', {}), format='lxml'),
-                    [
-                        partial(html_content_converter, selectors='main#main-content-area'),
-                        partial(sanitize_unicode_string, max_length=10240 * 5)
-                    ])
-
+    task.start_task(stop_event)
@@ -1,18 +1,11 @@
-from functools import partial
-
-import Scraper.RequestsScraper
-from GlobalConfig import APPLIED_PROXY, APPLIED_NATIONAL_TIMEOUT_MS
-from MyPythonUtility.easy_config import EasyConfig
-from ServiceEngine import ServiceContext
-from Tools.RSSFetcher import fetch_feed
-from Scraper.RequestsScraper import fetch_content
-from Scrubber.HTMLConvertor import html_content_converter
-from Scrubber.UnicodeSanitizer import sanitize_unicode_string
-from Workflow.CommonFeedsCrawFlow import feeds_craw_flow
+from types import MappingProxyType
+
+from GlobalConfig import APPLIED_NATIONAL_TIMEOUT_MS
+from Workflow.CommonFeedsCrawTask import FeedsCrawTask
 
 # https://www.bbc.com/
 
-feed_list = {
+feed_list = MappingProxyType({
     "Top Stories": "http://feeds.bbci.co.uk/news/rss.xml",
 
     "Africa": "http://feeds.bbci.co.uk/news/world/africa/rss.xml",
@@ -25,28 +18,22 @@ feed_list = {
     "Northern Ireland": "http://feeds.bbci.co.uk/news/northern_ireland/rss.xml",
     "Scotland": "http://feeds.bbci.co.uk/news/scotland/rss.xml",
     "Wales": "http://feeds.bbci.co.uk/news/wales/rss.xml",
-}
+})
 
 
-config: EasyConfig | None = None
+task = FeedsCrawTask('bbc',
+                     feed_list,
+                     feed_scraper='Scraper.RequestsScraper',
+                     content_scraper='Scraper.RequestsScraper',
+                     timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS,
+                     content_format='lxml',
+                     selectors='main[id="main-content"]',
+                     max_length=10240 * 5)
 
 
-def module_init(service_context: ServiceContext):
-    global config
-    config = service_context.config
+def module_init(service_context):
+    task.module_init(service_context)
 
 
 def start_task(stop_event):
-    feeds_craw_flow('bbc',
-                    feed_list,
-                    stop_event,
-                    config,
-                    15 * 60,
-
-                    partial(fetch_feed, scraper=Scraper.RequestsScraper, proxy=config.get('collector.global_site_proxy', {})),
-                    partial(fetch_content, timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS, proxy=config.get('collector.global_site_proxy', {}), format='lxml'),
-                    [
-                        partial(html_content_converter, selectors='main[id="main-content"]'),
-                        partial(sanitize_unicode_string, max_length=10240 * 5)
-                    ])
-
+    task.start_task(stop_event)
@@ -1,45 +1,32 @@
-from functools import partial
+from types import MappingProxyType
 
-import Scraper.RequestsScraper
-from GlobalConfig import APPLIED_PROXY, APPLIED_INTERNAL_TIMEOUT_MS
-from MyPythonUtility.easy_config import EasyConfig
-from ServiceEngine import ServiceContext
-from Tools.RSSFetcher import fetch_feed
-from Scraper.PlaywrightRenderedScraper import fetch_content
-from Scrubber.HTMLConvertor import html_content_converter
-from Scrubber.UnicodeSanitizer import sanitize_unicode_string
-from Workflow.CommonFeedsCrawFlow import feeds_craw_flow
+from GlobalConfig import APPLIED_INTERNAL_TIMEOUT_MS
+from Workflow.CommonFeedsCrawTask import FeedsCrawTask
 
-feed_list = {
+feed_list = MappingProxyType({
     "即时新闻": "https://www.chinanews.com.cn/rss/scroll-news.xml",
     "要闻导读": "https://www.chinanews.com.cn/rss/importnews.xml",
     "时政新闻": "https://www.chinanews.com.cn/rss/china.xml",
     "国际新闻": "https://www.chinanews.com.cn/rss/world.xml",
     "财经新闻": "https://www.chinanews.com.cn/rss/finance.xml"
-}
+})
 
 
-config: EasyConfig | None = None
+task = FeedsCrawTask('chinanews',
+                     feed_list,
+                     feed_scraper='Scraper.RequestsScraper',
+                     content_scraper='Scraper.PlaywrightRenderedScraper',
+                     timeout_ms=APPLIED_INTERNAL_TIMEOUT_MS,
+                     selectors='div.left_zw',
+                     max_length=10240)
 
 
-def module_init(service_context: ServiceContext):
-    global config
-    config = service_context.config
+def module_init(service_context):
+    task.module_init(service_context)
 
 
 def start_task(stop_event):
-    feeds_craw_flow('chinanews',
-                    feed_list,
-                    stop_event,
-                    config,
-                    15 * 60,
-
-                    partial(fetch_feed, scraper=Scraper.RequestsScraper, proxy=config.get('collector.global_site_proxy', {})),
-                    partial(fetch_content, timeout_ms=APPLIED_INTERNAL_TIMEOUT_MS, proxy=config.get('collector.global_site_proxy', {})),
-                    [
-                        partial(html_content_converter, selectors='div.left_zw'),
-                        partial(sanitize_unicode_string, max_length=10240)
-                    ])
+    task.start_task(stop_event)
 
 
 # def start_task(stop_event):
@@ -1,18 +1,11 @@
-from functools import partial
+from types import MappingProxyType
 
-import Scraper.RequestsScraper
 from GlobalConfig import APPLIED_NATIONAL_TIMEOUT_MS
-from MyPythonUtility.easy_config import EasyConfig
-from ServiceEngine import ServiceContext
-from Tools.RSSFetcher import fetch_feed
-from Scraper.PlaywrightRenderedScraper import fetch_content
-from Scrubber.HTMLConvertor import html_content_converter
-from Scrubber.UnicodeSanitizer import sanitize_unicode_string
-from Workflow.CommonFeedsCrawFlow import feeds_craw_flow
+from Workflow.CommonFeedsCrawTask import FeedsCrawTask
 
 # https://www.investing.com/
 
-feed_list = {
+feed_list = MappingProxyType({
     "Analysis": "https://www.investing.com/rss/121899.rss",
     "Market Overview": "https://www.investing.com/rss/market_overview.rss",
 
@@ -26,28 +19,22 @@ feed_list = {
     "Stock Market News": "https://www.investing.com/rss/news_25.rss",
     "Economic Indicators News": "https://www.investing.com/rss/news_95.rss",
     "Economy News": "https://www.investing.com/rss/news_14.rss",
-}
+})
 
 
-config: EasyConfig | None = None
+task = FeedsCrawTask('investing',
+                     feed_list,
+                     feed_scraper='Scraper.RequestsScraper',
+                     content_scraper='Scraper.PlaywrightRenderedScraper',
+                     timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS,
+                     content_format='lxml',
+                     selectors='div[id="article"]',
+                     max_length=10240 * 5)
 
 
-def module_init(service_context: ServiceContext):
-    global config
-    config = service_context.config
+def module_init(service_context):
+    task.module_init(service_context)
 
 
 def start_task(stop_event):
-    feeds_craw_flow('investing',
-                    feed_list,
-                    stop_event,
-                    config,
-                    15 * 60,
-
-                    partial(fetch_feed, scraper=Scraper.RequestsScraper, proxy=config.get('collector.global_site_proxy', {})),
-                    partial(fetch_content, timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS, proxy=config.get('collector.global_site_proxy', {}), format='lxml'),
-                    [
-                        partial(html_content_converter, selectors='div[id="article"]'),
-                        partial(sanitize_unicode_string, max_length=10240 * 5)
-                    ])
-
+    task.start_task(stop_event)
@@ -1,45 +1,32 @@
-from functools import partial
+from types import MappingProxyType
 
-import Scraper.RequestsScraper
 from GlobalConfig import APPLIED_NATIONAL_TIMEOUT_MS
-from MyPythonUtility.easy_config import EasyConfig
-from ServiceEngine import ServiceContext
-from Tools.RSSFetcher import fetch_feed
-from Scraper.RequestsScraper import fetch_content
-from Scrubber.HTMLConvertor import html_content_converter
-from Scrubber.UnicodeSanitizer import sanitize_unicode_string
-from Workflow.CommonFeedsCrawFlow import feeds_craw_flow
+from Workflow.CommonFeedsCrawTask import FeedsCrawTask
 
 # https://www.nhk.or.jp/
 
-feed_list = {
+feed_list = MappingProxyType({
     # "Main news": "https://www.nhk.or.jp/rss/news/cat0.xml",
     "Social": "https://www.nhk.or.jp/rss/news/cat1.xml",
     "Politics": "https://www.nhk.or.jp/rss/news/cat4.xml",
     "Economic": "https://www.nhk.or.jp/rss/news/cat5.xml",
     "International": "https://www.nhk.or.jp/rss/news/cat6.xml",
-}
+})
 
 
-config: EasyConfig | None = None
+task = FeedsCrawTask('nhk',
+                     feed_list,
+                     feed_scraper='Scraper.RequestsScraper',
+                     content_scraper='Scraper.RequestsScraper',
+                     timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS,
+                     content_format='lxml',
+                     selectors=['.module--detail-content'],
+                     max_length=10240 * 5)
 
 
-def module_init(service_context: ServiceContext):
-    global config
-    config = service_context.config
+def module_init(service_context):
+    task.module_init(service_context)
 
 
 def start_task(stop_event):
-    feeds_craw_flow('nhk',
-                    feed_list,
-                    stop_event,
-                    config,
-                    15 * 60,
-
-                    partial(fetch_feed, scraper=Scraper.RequestsScraper, proxy=config.get('collector.global_site_proxy', {})),
-                    partial(fetch_content, timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS, proxy=config.get('collector.global_site_proxy', {}), format='lxml'),
-                    [
-                        partial(html_content_converter, selectors=['.module--detail-content']),
-                        partial(sanitize_unicode_string, max_length=10240 * 5)
-                    ])
-
+    task.start_task(stop_event)
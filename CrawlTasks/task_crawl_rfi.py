@@ -1,18 +1,11 @@
-from functools import partial
-
-import Scraper.PlaywrightRawScraper
-from GlobalConfig import APPLIED_PROXY, APPLIED_NATIONAL_TIMEOUT_MS
-from MyPythonUtility.easy_config import EasyConfig
-from ServiceEngine import ServiceContext
-from Tools.RSSFetcher import fetch_feed
-from Scraper.PlaywrightRenderedScraper import fetch_content
-from Scrubber.HTMLConvertor import html_content_converter
-from Scrubber.UnicodeSanitizer import sanitize_unicode_string
-from Workflow.CommonFeedsCrawFlow import feeds_craw_flow
+from types import MappingProxyType
+
+from GlobalConfig import APPLIED_NATIONAL_TIMEOUT_MS
+from Workflow.CommonFeedsCrawTask import FeedsCrawTask
 
 # https://www.rfi.fr/
 
-feed_list = {
+feed_list = MappingProxyType({
     "Message": "https://www.rfi.fr/fr/contenu/general/rss",
     "Africa": "https://www.rfi.fr/afrique/rss",
     "Americas": "https://www.rfi.fr/ameriques/rss",
@@ -22,28 +15,22 @@ feed_list = {
     "Middle East": "https://www.rfi.fr/moyen-orient/rss",
     "Economy": "https://www.rfi.fr/economie/rss",
     "Science": "https://www.rfi.fr/science/rss",
-}
+})
 
 
-config: EasyConfig | None = None
+task = FeedsCrawTask('rfi',
+                     feed_list,
+                     feed_scraper='Scraper.PlaywrightRawScraper',
+                     content_scraper='Scraper.PlaywrightRenderedScraper',
+                     timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS,
+                     content_format='lxml',
+                     selectors='article.t-content__article-wrapper',
+                     max_length=10240 * 5)
 
 
-def module_init(service_context: ServiceContext):
-    global config
-    config = service_context.config
+def module_init(service_context):
+    task.module_init(service_context)
 
 
 def start_task(stop_event):
-    feeds_craw_flow('rfi',
-                    feed_list,
-                    stop_event,
-                    config,
-                    15 * 60,
-
-                    partial(fetch_feed, scraper=Scraper.PlaywrightRawScraper, proxy=config.get('collector.global_site_proxy', {})),
-                    partial(fetch_content, timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS, proxy=config.get('collector.global_site_proxy', {}), format='lxml'),
-                    [
-                        partial(html_content_converter, selectors='article.t-content__article-wrapper'),
-                        partial(sanitize_unicode_string, max_length=10240 * 5)
-                    ])
-
+    task.start_task(stop_event)
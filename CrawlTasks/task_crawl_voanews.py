@@ -1,19 +1,12 @@
-from functools import partial
-
-import Scraper.RequestsScraper
-from GlobalConfig import APPLIED_PROXY, APPLIED_NATIONAL_TIMEOUT_MS
-from MyPythonUtility.easy_config import EasyConfig
-from ServiceEngine import ServiceContext
-from Tools.RSSFetcher import fetch_feed
-from Scraper.PlaywrightRenderedScraper import fetch_content
-from Scrubber.HTMLConvertor import html_content_converter
-from Scrubber.UnicodeSanitizer import sanitize_unicode_string
-from Workflow.CommonFeedsCrawFlow import feeds_craw_flow
+from types import MappingProxyType
+
+from GlobalConfig import APPLIED_NATIONAL_TIMEOUT_MS
+from Workflow.CommonFeedsCrawTask import FeedsCrawTask
 
 # https://www.voanews.com/rssfeeds
 # Too much video content.
 
-feed_list = {
+feed_list = MappingProxyType({
     "USA": "https://www.voanews.com/api/zqboml-vomx-tpeivmy",
     "All About America": "https://www.voanews.com/api/zb__qtl-vomx-tpeqrtqq",
     "Immigration": "https://www.voanews.com/api/zgvmqyl-vomx-tpe-qvqv",
@@ -32,28 +25,21 @@ feed_list = {
 
     "Technology": "https://www.voanews.com/api/zyritl-vomx-tpettmq",
     "Economy": "https://www.voanews.com/api/zyboql-vomx-tpetvmi",
-}
+})
 
 
-config: EasyConfig | None = None
+task = FeedsCrawTask('voanews',
+                     feed_list,
+                     feed_scraper='Scraper.RequestsScraper',
+                     content_scraper='Scraper.PlaywrightRenderedScraper',
+                     timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS,
+                     selectors=['.title.pg-title', 'div.published', 'div.wsw, div.m-t-md'],
+                     max_length=10240)
 
 
-def module_init(service_context: ServiceContext):
-    global config
-    config = service_context.config
+def module_init(service_context):
+    task.module_init(service_context)
 
 
 def start_task(stop_event):
-    feeds_craw_flow('voanews',
-                    feed_list,
-                    stop_event,
-                    config,
-                    15 * 60,
-
-                    partial(fetch_feed, scraper=Scraper.RequestsScraper, proxy=config.get('collector.global_site_proxy', {})),
-                    partial(fetch_content, timeout_ms=APPLIED_NATIONAL_TIMEOUT_MS, proxy=config.get('collector.global_site_proxy', {})),
-                    [
-                        partial(html_content_converter, selectors=['.title.pg-title', 'div.published', 'div.wsw, div.m-t-md']),
-                        partial(sanitize_unicode_string, max_length=10240)
-                    ])
-
+    task.start_task(stop_event)
@@ -9,13 +9,13 @@ import threading
 
 from attr import dataclass
 from typing import Tuple, Optional, Dict
-from pymongo.errors import ConnectionFailure
+from pymongo.errors import BulkWriteError, ConnectionFailure
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type, retry_if_result, TryAgain
 
 from ServiceComponent.IntelligenceStatisticsEngine import IntelligenceStatisticsEngine
 from ServiceComponent.RecommendationManager import RecommendationManager
 from prompts import ANALYSIS_PROMPT, SUGGESTION_PROMPT
-from Tools.MongoDBAccess import MongoDBStorage
+from Tools.MongoDBAccess import MongoDBStorage, MongoDBOperationError
 from Tools.OpenAIClient import OpenAICompatibleAPI
 from Tools.DateTimeUtility import time_str_to_datetime, get_aware_time
 from MyPythonUtility.DictTools import check_sanitize_dict
@@ -29,6 +29,33 @@ from ServiceComponent.IntelligenceAnalyzerProxy import analyze_with_ai, aggressi
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# The post process worker archives up to ARCHIVE_BATCH_SIZE processed items with one insert.
+# It waits at most ARCHIVE_FLUSH_S after the first item for the batch to fill.
+ARCHIVE_BATCH_SIZE = 100
+ARCHIVE_FLUSH_S = 0.2
+
+# Collected data is cached by the cache writer thread, up to CACHE_BATCH_SIZE items with one insert, instead of
+# by the request that submits it. The items are queued for analysis after they are cached.
+CACHE_BATCH_SIZE = 100
+CACHE_FLUSH_S = 0.05
+
+# The documents fetched per round-trip when the unarchived data is loaded at startup.
+UNARCHIVED_LOAD_BATCH_SIZE = 1000
+
+# The AI round-trip dominates the analysis. These threads share original_queue and run that many requests at once.
+ANALYSIS_THREADS = 4
+
+# Indexes for the fields the hub queries on. Pass them to the MongoDBStorage of the cache and archive collections.
+# UUID is not unique here: a unique index can't be built on a collection that already holds duplicates.
+CACHE_DB_INDEXES = [
+    [('UUID', pymongo.ASCENDING)],
+]
+ARCHIVE_DB_INDEXES = [
+    [('UUID', pymongo.ASCENDING)],                                      # Duplication check
+    [('INFORMANT', pymongo.ASCENDING)],                                 # Duplication check ($or with UUID)
+    [(f'APPENDIX.{APPENDIX_TIME_ARCHIVED}', pymongo.DESCENDING)],       # Listing, statistics and RSS
+]
+
 
 class IntelligenceHub:
     @dataclass
@@ -56,7 +83,8 @@ class IntelligenceHub:
                  db_cache: Optional[MongoDBStorage] = None,
                  db_archive: Optional[MongoDBStorage] = None,
                  db_recommendation: Optional[MongoDBStorage] = None,
-                 ai_client: OpenAICompatibleAPI = None):
+                 ai_client: OpenAICompatibleAPI = None,
+                 analysis_threads: int = ANALYSIS_THREADS):
         """
         Init IntelligenceHub.
         :param ref_url: The reference url for sub-resource url generation.
@@ -64,6 +92,7 @@ class IntelligenceHub:
         :param db_cache: The mongodb for caching collected data.
         :param db_archive: The mongodb for archiving processed data.
         :param ai_client: The openai-like client for data processing.
+        :param analysis_threads: The number of concurrent AI analysis. Keep it within the AI service's rate limit.
         """
 
         # ---------------- Parameters ----------------
@@ -77,8 +106,10 @@ class IntelligenceHub:
 
         # -------------- Queues Related --------------
 
-        self.original_queue = queue.Queue()             # Original intelligence queue
-        self.processed_queue = queue.Queue()            # Processed intelligence queue
+        # Plain FIFOs between the threads. SimpleQueue has no task tracking, nobody join()s them.
+        self.caching_queue = queue.SimpleQueue()        # Collected intelligence waiting to be cached
+        self.original_queue = queue.SimpleQueue()       # Original intelligence queue
+        self.processed_queue = queue.SimpleQueue()      # Processed intelligence queue
         self.archived_counter = 0
         self.drop_counter = 0
         self.error_counter = 0
@@ -118,8 +149,10 @@ class IntelligenceHub:
         self.lock = threading.Lock()
         self.shutdown_flag = threading.Event()
 
-        self.analysis_thread = threading.Thread(target=self._ai_analysis_thread, daemon=True)
+        self.analysis_threads = [threading.Thread(target=self._ai_analysis_thread, name=f'AIAnalysis-{i}', daemon=True)
+                                 for i in range(max(1, analysis_threads))]
         self.post_process_thread = threading.Thread(target=self._post_process_worker, daemon=True)
+        self.cache_writer_thread = threading.Thread(target=self._cache_writer_worker, daemon=True)
 
         # ------------------ Tasks ------------------
 
@@ -154,6 +187,13 @@ class IntelligenceHub:
         if self.vector_db_idx:
             self.vector_db_idx.load()
 
+    def _save_vector_db(self):
+        try:
+            if self.vector_db_idx:
+                self.vector_db_idx.save()
+        except Exception as e:
+            logger.error(f'Save vector db fail: {str(e)}')
+
     def _load_unarchived_data(self):
         """Load unarchived data into a queue, compatible with both old and new archival markers."""
         if not self.mongo_db_cache:
@@ -170,14 +210,17 @@ class IntelligenceHub:
                 ]
             }
 
-            cursor = self.mongo_db_cache.collection.find(query)
+            # Every field is needed for the analysis, so no projection. Fetch more documents per round-trip instead.
+            cursor = self.mongo_db_cache.collection.find(query).batch_size(UNARCHIVED_LOAD_BATCH_SIZE)
+            # UUID is not unique in the cache. A cached original that was written twice is analysed only once.
+            loaded_uuids = set()
             for doc in cursor:
+                if _uuid := doc.get('UUID'):
+                    if _uuid in loaded_uuids:
+                        continue
+                    loaded_uuids.add(_uuid)
                 doc['_id'] = str(doc['_id'])  # 转换ObjectId
-                try:
-                    self.original_queue.put(doc, block=True, timeout=5)
-                except queue.Full:
-                    logger.error("Queue full, failed to add document")
-                    break
+                self.original_queue.put(doc)
 
             logger.info(f'Unarchived data loaded, item count: {self.original_queue.qsize()}')
 
@@ -187,8 +230,10 @@ class IntelligenceHub:
     # ----------------------------------------------- Startup / Shutdown -----------------------------------------------
 
     def startup(self):
-        self.analysis_thread.start()
+        for thread in self.analysis_threads:
+            thread.start()
         self.post_process_thread.start()
+        self.cache_writer_thread.start()
 
     def shutdown(self, timeout=10):
         logger.info("Intelligence hub shutting down...")
@@ -200,8 +245,10 @@ class IntelligenceHub:
         self._clear_queues()
 
         # 等待工作线程结束
-        self.analysis_thread.join(timeout=timeout)
+        for thread in self.analysis_threads:
+            thread.join(timeout=timeout)
         self.post_process_thread.join(timeout=timeout)
+        self.cache_writer_thread.join(timeout=timeout)
 
         # 清理资源
         self._cleanup_resources()
@@ -210,18 +257,32 @@ class IntelligenceHub:
     # --------------------------------------- Shutdowns ---------------------------------------
 
     def _clear_queues(self):
+        # The submissions not cached yet are cached now, so they are loaded as unarchived data by the next startup.
+        uncached = []
+        try:
+            while True:
+                if data := self.caching_queue.get_nowait():
+                    uncached.append(data)
+        except queue.Empty:
+            pass
+        self._cache_original_batch(uncached)
+
+        # SimpleQueue.get_nowait() is thread-safe on its own. The counters' lock is not needed here.
         unprocessed = []
-        with self.lock:
-            while not self.original_queue.empty():
-                item = self.original_queue.get()
-                unprocessed.append(item)
-                self.original_queue.task_done()
+        try:
+            while True:
+                unprocessed.append(self.original_queue.get_nowait())
+        except queue.Empty:
+            pass
+        for _ in self.analysis_threads:
+            self.original_queue.put(None)
+        self.processed_queue.put(None)
+        self.caching_queue.put(None)
         # 保存到文件或数据库
         # self._save_to_file(unprocessed, 'pending_tasks.json')
 
     def _cleanup_resources(self):
-        if self.vector_db_idx:
-            self.vector_db_idx.save()
+        self._save_vector_db()
 
         if self.mongo_db_cache:
             self.mongo_db_cache.close()
@@ -234,6 +295,7 @@ class IntelligenceHub:
     @property
     def statistics(self):
         return {
+            'waiting_cache': self.caching_queue.qsize(),
             'waiting_process': self.original_queue.qsize(),
             'post_process': self.processed_queue.qsize(),
             'archived': self.archived_counter,
@@ -250,13 +312,15 @@ class IntelligenceHub:
 
     def submit_collected_data(self, data: dict) -> True or Error:
         try:
-            if self._check_data_duplication(data, False):
-                return IntelligenceHub.Error(error_list=[f"Collected message duplicated {data.get('UUID', '')}."])
+            # Validate in process first, so a malformed submission never costs the duplication query
+            validated_data, error_text = check_sanitize_dict(data, CollectedData)
+            if error_text:
+                return IntelligenceHub.Error(error_list=[error_text])
 
-            validated_data, error_text = check_sanitize_dict(dict(data), CollectedData)
+            if self._check_data_duplication(validated_data, False):
+                return IntelligenceHub.Error(error_list=[f"Collected message duplicated {data.get('UUID', '')}."])
 
-            return IntelligenceHub.Error(error_list=[error_text]) \
-                if error_text else self._enqueue_collected_data(validated_data)
+            return self._enqueue_collected_data(validated_data)
 
         except Exception as e:
             logger.error(f"Submit collected data API exception: {str(e)}")
@@ -264,13 +328,14 @@ class IntelligenceHub:
 
     def submit_archived_data(self, data: dict) -> True or Error:
         try:
-            if self._check_data_duplication(data, False):
-                return IntelligenceHub.Error(error_list=[f"Archived message duplicated {data.get('UUID', '')}."])
+            validated_data, error_text = check_sanitize_dict(data, ArchivedData)
+            if error_text:
+                return IntelligenceHub.Error(error_list=[error_text])
 
-            validated_data, error_text = check_sanitize_dict(dict(data), ArchivedData)
+            if self._check_data_duplication(validated_data, False):
+                return IntelligenceHub.Error(error_list=[f"Archived message duplicated {data.get('UUID', '')}."])
 
-            return IntelligenceHub.Error(error_list=[error_text]) \
-                if error_text else self._enqueue_processed_data(validated_data)
+            return self._enqueue_processed_data(validated_data)
 
         except Exception as e:
             logger.error(f"Submit archived data API exception: {str(e)}")
@@ -367,11 +432,12 @@ class IntelligenceHub:
         result = analyze_with_ai(self.open_ai_client, ANALYSIS_PROMPT, original_data)
 
         # Check warning and error for statistics
-        if 'error' in result:
-            self.conversation_error += 1
-        elif 'warning' in result:
-            self.conversation_warning += 1
-        self.conversation_total += 1
+        with self.lock:
+            if 'error' in result:
+                self.conversation_error += 1
+            elif 'warning' in result:
+                self.conversation_warning += 1
+            self.conversation_total += 1
 
         return result
 
@@ -386,7 +452,6 @@ class IntelligenceHub:
             try:
                 original_data = self.original_queue.get(block=True)
                 if not original_data:
-                    self.original_queue.task_done()
                     continue
             except queue.Empty:
                 continue
@@ -440,7 +505,7 @@ class IntelligenceHub:
                 if original_informant := str(original_data.get('INFORMANT', '')).strip():
                     result['INFORMANT'] = original_informant
 
-                validated_data, error_text = check_sanitize_dict(dict(result), ProcessedData)
+                validated_data, error_text = check_sanitize_dict(result, ProcessedData)
                 if error_text:
                     raise ValueError(error_text)
 
@@ -464,7 +529,8 @@ class IntelligenceHub:
                 validated_data['SUBMITTER'] = 'Analysis Thread'
 
                 if not self._enqueue_processed_data(validated_data):
-                    self.error_counter += 1
+                    with self.lock:
+                        self.error_counter += 1
 
             except IntelligenceHub.Exception as e:
                 if e.name == 'drop':
@@ -476,22 +542,17 @@ class IntelligenceHub:
                     self.error_counter += 1
                 logger.error(f"Analysis error: {str(e)}")
                 self._mark_cache_data_archived_flag(original_uuid, ARCHIVED_FLAG_ERROR)
-            finally:
-                self.original_queue.task_done()
 
     def _post_process_worker(self):
         while not self.shutdown_flag.is_set():
-            try:
-                try:
-                    data = self.processed_queue.get(block=True)
-                    if not data:
-                        self.processed_queue.task_done()
-                        continue
-                except queue.Empty:
-                    continue
+            batch = [data for data in self._drain_queue(self.processed_queue, ARCHIVE_BATCH_SIZE, ARCHIVE_FLUSH_S)
+                     if data]
+            if not batch:
+                continue
 
-                # ----------------------- Record the max rate for easier filter -----------------------
+            # ----------------------- Record the max rate for easier filter -----------------------
 
+            for data in batch:
                 if 'APPENDIX' not in data:
                     data['APPENDIX'] = {}
                 rate_dict = data.get('RATE', {'N/A': '0'})
@@ -503,30 +564,63 @@ class IntelligenceHub:
                 data['APPENDIX'][APPENDIX_MAX_RATE_CLASS] = max_key
                 data['APPENDIX'][APPENDIX_MAX_RATE_SCORE] = max_value
 
-                # -------------------- Post Process: Archive, Indexing, To RSS, ... --------------------
+            # -------------------- Post Process: Archive, Indexing, To RSS, ... --------------------
+
+            self._archive_processed_batch(batch)
 
+            # The counters are shared with the analysis threads. Take the lock once per batch, not per item.
+            with self.lock:
+                self.archived_counter += len(batch)
+
+            errors = 0
+            for data in batch:
                 try:
-                    self._archive_processed_data(data)
-                    with self.lock:
-                        self.archived_counter += 1
                     self._mark_cache_data_archived_flag(data['UUID'], ARCHIVED_FLAG_ARCHIVED)
 
-                    logger.info(f"Message {data['UUID']} archived.")
+                    logger.info("Message %s archived.", data['UUID'])
 
-                    self._index_archived_data(data)
                     # self._publish_article_to_rss(data)
 
                     # TODO: Call post processor plugins
                 except Exception as e:
-                    with self.lock:
-                        self.error_counter += 1
+                    errors += 1
                     logger.error(f"Archived fail with exception: {str(e)}")
                     self._mark_cache_data_archived_flag(data['UUID'], ARCHIVED_FLAG_ERROR)
-                finally:
-                    self.processed_queue.task_done()
-            except queue.Empty:
+            if errors:
+                with self.lock:
+                    self.error_counter += errors
+
+            self._index_archived_batch(batch)
+            self._save_vector_db()
+
+    def _cache_writer_worker(self):
+        while not self.shutdown_flag.is_set():
+            batch = [data for data in self._drain_queue(self.caching_queue, CACHE_BATCH_SIZE, CACHE_FLUSH_S) if data]
+            if not batch:
                 continue
 
+            # Cache first, so the analysis result never marks a document that is not in the cache yet.
+            self._cache_original_batch(batch)
+            for data in batch:
+                self.original_queue.put(data)
+
+    def _drain_queue(self, q: queue.SimpleQueue, max_items: int, flush_s: float) -> list:
+        """
+        Block for the next item of q, then take the items that arrive within flush_s, up to max_items.
+        The returned items may include the None put to wake the thread up.
+        """
+        items = [q.get(block=True)]
+        deadline = time.monotonic() + flush_s
+        while len(items) < max_items and not self.shutdown_flag.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(q.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+
     # ------------------------------------------------ Scheduled Tasks -------------------------------------------------
 
     def _do_export_mongodb_weekly(self):
@@ -584,8 +678,7 @@ class IntelligenceHub:
         del data['token']
         data[APPENDIX_TIME_GOT] = time.time()
 
-        self._cache_original_data(data)
-        self.original_queue.put(data)
+        self.caching_queue.put(data)
 
         return True
 
@@ -616,11 +709,16 @@ class IntelligenceHub:
 
     # ---------------------------- Archive Related ----------------------------
 
-    def _index_archived_data(self, data: dict):
-        if self.vector_db_idx:
-            self.vector_db_idx.add_text(data['UUID'], data['EVENT_TEXT'])
-            # TODO: Decrease save frequency.
-            self.vector_db_idx.save()
+    def _index_archived_batch(self, batch: List[dict]):
+        try:
+            if self.vector_db_idx:
+                # One embedding pass and one index add for the whole batch. Saved by the post process worker.
+                indexing = [data for data in batch if data.get('EVENT_TEXT')]
+                if indexing:
+                    self.vector_db_idx.add_batch([data['UUID'] for data in indexing],
+                                                 [data['EVENT_TEXT'] for data in indexing])
+        except Exception as e:
+            logger.error(f'Index archived batch fail: {str(e)}')
 
     def _cache_original_data(self, data: dict):
         try:
@@ -637,6 +735,44 @@ class IntelligenceHub:
         except Exception as e:
             logger.error(f'Archive processed data fail: {str(e)}')
 
+    def _cache_original_batch(self, batch: List[dict]):
+        if self.mongo_db_cache and batch:
+            self._bulk_insert(self.mongo_db_cache, batch, self._cache_original_data, 'Cache')
+
+    def _archive_processed_batch(self, batch: List[dict]):
+        if self.mongo_db_archive and batch:
+            self._bulk_insert(self.mongo_db_archive, batch, self._archive_processed_data, 'Archive')
+
+    @staticmethod
+    def _bulk_insert(db: MongoDBStorage, batch: List[dict], insert_one, name: str):
+        """Insert with one unordered insert_many. The documents that failed in it are retried one by one."""
+        try:
+            db.bulk_insert(batch)
+        except MongoDBOperationError as e:
+            if isinstance(e.__cause__, BulkWriteError):
+                failed = [batch[error['index']] for error in e.__cause__.details.get('writeErrors', [])]
+            else:
+                # A connection error can break an unordered insert_many after part of the batch is written.
+                # UUID is not unique in these collections, so retrying the written documents would duplicate them.
+                failed = IntelligenceHub._unwritten_documents(db, batch, name)
+            logger.error(f'{name} batch fail, retry {len(failed)} of {len(batch)} one by one: {str(e.__cause__)}')
+            for data in failed:
+                insert_one(data)
+        except Exception as e:
+            logger.error(f'{name} batch fail: {str(e)}')
+
+    @staticmethod
+    def _unwritten_documents(db: MongoDBStorage, batch: List[dict], name: str) -> List[dict]:
+        """The documents of batch whose UUID is not in db. Empty if that can't be told."""
+        try:
+            written = db.find_many({'UUID': {'$in': [data['UUID'] for data in batch]}}, projection={'UUID': 1})
+        except Exception as e:
+            logger.error(f'{name} batch not retried, cannot tell the written documents: {str(e)}. '
+                         f'UUIDs: {[data["UUID"] for data in batch]}')
+            return []
+        written_uuids = {doc['UUID'] for doc in written}
+        return [data for data in batch if data['UUID'] not in written_uuids]
+
     def _mark_cache_data_archived_flag(self, _uuid: str, archived: bool or str):
         """
         20250530: Extend the archived parameter as str. It can be the following values:
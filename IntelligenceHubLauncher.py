@@ -6,6 +6,7 @@ Function: Starts the IntelligenceHubLauncher application using either Waitress o
 Design: Uses adapter pattern to support multiple WSGI servers with common interface.
 """
 
+import os
 import sys
 import time
 import logging
@@ -25,7 +26,7 @@ SERVER_TYPE = None  # Set to 'waitress', 'gunicorn', or None for auto-detection
 
 HOST = "0.0.0.0"
 PORT = 5000
-THREADS = 4
+THREADS = min(32, (os.cpu_count() or 1) * 4)   # Request threads of Waitress. Requests are mostly I/O bound.
 WORKERS = 1
 
 # ================== Gunicorn server parameters ==================
@@ -191,15 +192,18 @@ class WaitressServer(ServerAdapter):
     def start_server(self):
         """Start Waitress server"""
         try:
-            from waitress import serve
+            from waitress import create_server
 
             self.logger.info(f"Starting Waitress server on {self.host}:{self.port}")
             self.logger.info(f"Waitress configuration: {self.get_server_info()}")
 
+            # Keep the server object so stop_server() can close it and free the port for a restart
+            self.wsgi_server = create_server(wsgi_app, host=self.host, port=self.port, threads=self.threads)
+
             # Run Waitress in a separate thread
             def run_waitress():
                 try:
-                    serve(wsgi_app, host=self.host, port=self.port, threads=self.threads)
+                    self.wsgi_server.run()
                 except Exception as e:
                     self.logger.error(f"Waitress server error: {str(e)}")
                 finally:
@@ -224,7 +228,10 @@ class WaitressServer(ServerAdapter):
 
     def stop_server(self):
         """Stop Waitress server"""
-        # Waitress runs in a thread, so we just mark it as stopped
+        # Closing the listening socket ends run() in the server thread
+        if getattr(self, 'wsgi_server', None):
+            self.wsgi_server.close()
+            self.wsgi_server = None
         self.server_running = False
         self.logger.info("Waitress server stopped")
 
@@ -305,7 +312,7 @@ class ServerManager:
         self.logger = None
         self.server = None
         self.restart_count = 0
-        self.last_restart_time = 0
+        self.last_restart_time = float('-inf')     # time.monotonic() of the last restart
         self.setup_logging()
         self.determine_server_type()
 
@@ -370,7 +377,7 @@ class ServerManager:
 
     def restart_server(self):
         """Restart the server with cooldown and attempt limits"""
-        current_time = time.time()
+        current_time = time.monotonic()
 
         # Check restart cooldown
         if current_time - self.last_restart_time < RESTART_COOLDOWN:
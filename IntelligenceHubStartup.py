@@ -10,7 +10,7 @@ from typing import Tuple
 from functools import partial
 
 from GlobalConfig import *
-from IntelligenceHub import IntelligenceHub
+from IntelligenceHub import IntelligenceHub, ANALYSIS_THREADS, CACHE_DB_INDEXES, ARCHIVE_DB_INDEXES
 from ServiceComponent.AIServiceRotator import SiliconFlowServiceRotator
 from Tools.MongoDBAccess import MongoDBStorage
 from Tools.OpenAIClient import OpenAICompatibleAPI
@@ -59,6 +59,7 @@ def start_intelligence_hub_service() -> Tuple[IntelligenceHub, IntelligenceHubWe
     ai_service_token = config.get('intelligence_hub.ai_service.token', 'Sleepy')
     ai_service_model = config.get('intelligence_hub.ai_service.model', MODEL_SELECT)
     ai_service_proxies = config.get('intelligence_hub.ai_service.proxies', None)
+    ai_service_concurrency = config.get('intelligence_hub.ai_service.concurrency', ANALYSIS_THREADS)
 
     api_client = OpenAICompatibleAPI(
         api_base_url=ai_service_url,
@@ -87,7 +88,8 @@ def start_intelligence_hub_service() -> Tuple[IntelligenceHub, IntelligenceHubWe
             db_name='IntelligenceIntegrationSystem',
             username=mongodb_user,
             password=mongodb_pass,
-            collection_name='intelligence_cached'),
+            collection_name='intelligence_cached',
+            indexes=CACHE_DB_INDEXES),
 
         db_archive=MongoDBStorage(
             host=mongodb_host,
@@ -95,7 +97,8 @@ def start_intelligence_hub_service() -> Tuple[IntelligenceHub, IntelligenceHubWe
             db_name='IntelligenceIntegrationSystem',
             username=mongodb_user,
             password=mongodb_pass,
-            collection_name='intelligence_archived'),
+            collection_name='intelligence_archived',
+            indexes=ARCHIVE_DB_INDEXES),
 
         db_recommendation=MongoDBStorage(
             host=mongodb_host,
@@ -105,7 +108,8 @@ def start_intelligence_hub_service() -> Tuple[IntelligenceHub, IntelligenceHubWe
             password=mongodb_pass,
             collection_name='intelligence_recommendation'),
 
-        ai_client = api_client
+        ai_client = api_client,
+        analysis_threads = ai_service_concurrency
     )
     hub.startup()
 
@@ -49,6 +49,9 @@ COLLECTION_SUMMARY = "intelligence_summary"
 SEARCH_SCORE_THRESHOLD = 0.5  # Default similarity threshold (0.0 to 1.0)
 SEARCH_TOP_N = 5
 
+# Documents are vectorized and saved in batches of this size
+REBUILD_BATCH_SIZE = 64
+
 
 # --- Helper Functions ---
 
@@ -93,7 +96,7 @@ def func_rebuild(store_full_text: VectorStoreManager, store_summary: VectorStore
     from tqdm import tqdm
 
     collection = connect_to_mongo()
-    if collection is not None:
+    if collection is None:
         return
 
     # Get total count for progress bar
@@ -113,6 +116,16 @@ def func_rebuild(store_full_text: VectorStoreManager, store_summary: VectorStore
     processed_count = 0
     skipped_count = 0
 
+    # Pending (texts, uuids) of each store, added by one add_documents() call per batch
+    pending_full = ([], [])
+    pending_summary = ([], [])
+
+    def flush(store: VectorStoreManager, pending):
+        if pending[0]:
+            store.add_documents(*pending)
+            pending[0].clear()
+            pending[1].clear()
+
     # Use tqdm for progress
     with tqdm(total=total_docs, desc="Rebuilding Indexes") as pbar:
         for doc in collection.find():
@@ -121,15 +134,14 @@ def func_rebuild(store_full_text: VectorStoreManager, store_summary: VectorStore
                 uuid = doc.get('UUID')
                 if not uuid:
                     skipped_count += 1
-                    pbar.update(1)
                     continue
 
                 # 2. Process 'intelligence_full_text'
                 raw_data = doc.get('APPENDIX', {}).get('RAW_DATA')
                 if raw_data:
                     # Robustly handle if RAW_DATA is dict or text
-                    text_full = str(raw_data)
-                    store_full_text.add_document(text_full, uuid)
+                    pending_full[0].append(str(raw_data))
+                    pending_full[1].append(uuid)
 
                 # 3. Process 'intelligence_summary'
                 title = doc.get('EVENT_TITLE', '') or ''
@@ -139,10 +151,16 @@ def func_rebuild(store_full_text: VectorStoreManager, store_summary: VectorStore
                 text_summary = f"{title}\n{brief}\n{text}".strip()
 
                 if text_summary:
-                    store_summary.add_document(text_summary, uuid)
+                    pending_summary[0].append(text_summary)
+                    pending_summary[1].append(uuid)
 
                 processed_count += 1
 
+                if len(pending_full[0]) >= REBUILD_BATCH_SIZE:
+                    flush(store_full_text, pending_full)
+                if len(pending_summary[0]) >= REBUILD_BATCH_SIZE:
+                    flush(store_summary, pending_summary)
+
             except Exception as e:
                 print(f"\nError processing doc {doc.get('UUID', 'N/A')}: {e}")
                 skipped_count += 1
@@ -150,6 +168,9 @@ def func_rebuild(store_full_text: VectorStoreManager, store_summary: VectorStore
             finally:
                 pbar.update(1)
 
+        flush(store_full_text, pending_full)
+        flush(store_summary, pending_summary)
+
     print("\n--- Rebuild Complete ---")
     print(f"Successfully processed: {processed_count}")
     print(f"Skipped (e.g., no UUID): {skipped_count}")
@@ -169,16 +169,15 @@ def analyze_with_ai(
         logger.error(f'Validate AI data fail: {str(e)}')
         return {'error': str(e)}
 
-    metadata_items = [f"- {k}: {v}" for k, v in sanitized_data.items() if k != "content"]
-    metadata_block = '## metadata\n' + "\n".join(metadata_items)
-    content_block = f"\n\n## 正文内容\n{sanitized_data['content']}"
-    user_message = metadata_block + content_block
+    # Build the message with one join and one format instead of a temporary list and chained concatenations.
+    metadata_lines = "\n".join(f"- {k}: {v}" for k, v in sanitized_data.items() if k != "content")
+    user_message = f"## metadata\n{metadata_lines}\n\n## 正文内容\n{sanitized_data['content']}"
 
     messages = context if context else []
     messages.append({"role": "system", "content": prompt})
     messages.append({"role": "user", "content": user_message})
 
-    start = time.time()
+    start = time.monotonic()
 
     response = api_client.create_chat_completion_sync(
         messages=messages,
@@ -186,7 +185,7 @@ def analyze_with_ai(
         max_tokens=MAX_OUTPUT_TOKEN
     )
 
-    elapsed = time.time() - start
+    elapsed = time.monotonic() - start
     print(f"AI response spends {elapsed} s")
 
     return conversation_common_process('analysis', messages, response)
@@ -211,7 +210,7 @@ def aggressive_by_ai(
         {"role": "system", "content": prompt},
         {"role": "user", "content": user_message}]
 
-    start = time.time()
+    start = time.monotonic()
 
     response = api_client.create_chat_completion_sync(
         messages=messages,
@@ -219,7 +218,7 @@ def aggressive_by_ai(
         max_tokens=MAX_OUTPUT_TOKEN
     )
 
-    elapsed = time.time() - start
+    elapsed = time.monotonic() - start
     print(f"AI response spends {elapsed} s")
 
     return conversation_common_process('aggressive', messages, response)
@@ -236,7 +235,7 @@ def generate_recommendation_by_ai(
         {"role": "system", "content": prompt},
         {"role": "user", "content": intelligence_table}]
 
-    start = time.time()
+    start = time.monotonic()
 
     response = api_client.create_chat_completion_sync(
         messages=messages,
@@ -244,7 +243,7 @@ def generate_recommendation_by_ai(
         max_tokens=MAX_OUTPUT_TOKEN
     )
 
-    elapsed = time.time() - start
+    elapsed = time.monotonic() - start
     print(f"AI response spends {elapsed} s")
 
     return conversation_common_process('recommendation', messages, response)
@@ -36,21 +36,17 @@ class IntelligenceCache:
             if data.get('APPENDIX', {}).get(APPENDIX_MAX_RATE_SCORE, 10) < self.threshold:
                 return False
 
-            if not self.cache:
-                self.cache.insert(0, data)
-                return True
-
-            # Find the correct position to insert (maintain descending order)
-            for i, cached_item in enumerate(self.cache):
-                cached_time = cached_item['APPENDIX'][APPENDIX_TIME_ARCHIVED]
-
+            # Binary search the correct position to insert (maintain descending order):
+            # before the first item that is earlier than the new data, or at the end if there's none.
+            low, high = 0, len(self.cache)
+            while low < high:
+                mid = (low + high) // 2
                 # 如果新数据时间更晚，插入到当前位置前面
-                if archive_time > cached_time:
-                    insert_index = i
-                    break
-            else:
-                # 循环正常结束（未break），说明新数据是最早的，插入到末尾
-                insert_index = len(self.cache)
+                if archive_time > self.cache[mid]['APPENDIX'][APPENDIX_TIME_ARCHIVED]:
+                    high = mid
+                else:
+                    low = mid + 1
+            insert_index = low
 
             # Insert at the found position
             self.cache.insert(insert_index, data)
@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import patch, MagicMock
 import tempfile
 import shutil
+import threading
 
 from Tools.ContentHistory import _ContentHistoryManager
 
@@ -39,6 +40,15 @@ class TestContentHistoryManager(unittest.TestCase):
         self.assertIn("TestCategory", str(filepath))
         self.assertIn("TestTitle", str(filepath))
 
+    def test_thread_connection_closed_on_exit(self):
+        for i in range(20):
+            thread = threading.Thread(target=self.manager.existing_urls, args=([f"https://example.com/{i}"],))
+            thread.start()
+            thread.join()
+
+        # Only the connections of this thread and the writer thread are left
+        self.assertLessEqual(len(self.manager._connections), 2)
+
 
 if __name__ == '__main__':
     unittest.main()
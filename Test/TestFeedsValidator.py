@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+
+import Tools.FeedsValidator as FeedsValidator
+from Tools.FeedsValidator import FeedValidator, FEED_ROOT_TAGS
+
+ATOM_FEED = b'<?xml version="1.0" encoding="utf-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom"><title>t</title></feed>'
+RDF_FEED = (b'<?xml version="1.0"?>\n<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+            b'xmlns="http://purl.org/rss/1.0/"><channel/></rdf:RDF>')
+
+
+def chunked(content: bytes, size: int):
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+class TestFeedRootTag(unittest.TestCase):
+    def check_root_tags(self):
+        self.assertEqual(FeedValidator._root_tag([b'<rss version="2.0"><channel/></rss>']), 'rss')
+        self.assertEqual(FeedValidator._root_tag([ATOM_FEED]), '{http://www.w3.org/2005/Atom}feed')
+        self.assertEqual(FeedValidator._root_tag([RDF_FEED]), '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}RDF')
+        self.assertEqual(FeedValidator._root_tag([b'<!DOCTYPE html><html><body/></html>']), 'html')
+
+        # Root tag split across chunks and behind a prologue longer than a chunk
+        self.assertEqual(FeedValidator._root_tag(chunked(ATOM_FEED, 7)), '{http://www.w3.org/2005/Atom}feed')
+        self.assertEqual(FeedValidator._root_tag([b'<!--' + b'x' * 10000 + b'--><rss>']), 'rss')
+
+        self.assertIsNone(FeedValidator._root_tag([b'{"feeds": {}}']))
+        self.assertIsNone(FeedValidator._root_tag([b'']))
+        self.assertIsNone(FeedValidator._root_tag([]))
+
+    def test_root_tag(self):
+        self.check_root_tags()
+
+    def test_root_tag_without_lxml(self):
+        with patch.object(FeedsValidator, 'lxml_etree', None):
+            self.check_root_tags()
+
+    def test_is_valid_rss(self):
+        self.assertTrue(FeedValidator._is_valid_rss(b'<rss><channel/></rss>'))
+        self.assertTrue(FeedValidator._is_valid_rss(ATOM_FEED.decode('utf-8')))
+        self.assertFalse(FeedValidator._is_valid_rss(b'<feed><title>No Atom namespace</title></feed>'))
+        self.assertFalse(FeedValidator._is_valid_rss(b'<html></html>'))
+        self.assertIn(FeedValidator._root_tag([RDF_FEED]), FEED_ROOT_TAGS)
+
+    def test_may_be_feed(self):
+        for content_type in (None, '', 'application/rss+xml; charset=utf-8', 'text/xml', 'text/html', 'text/plain'):
+            self.assertTrue(FeedValidator._may_be_feed(content_type), content_type)
+        for content_type in ('image/png', 'Application/JSON; charset=utf-8', 'video/mp4'):
+            self.assertFalse(FeedValidator._may_be_feed(content_type), content_type)
+
+
+class TestFeedRootSniff(unittest.TestCase):
+    def test_plain_roots(self):
+        self.assertEqual(FeedValidator._sniff_root_tag(b'\xef\xbb\xbf<?xml version="1.0"?>\n<!-- c -->\n<rss>'), 'rss')
+        self.assertEqual(FeedValidator._sniff_root_tag(ATOM_FEED), '{http://www.w3.org/2005/Atom}feed')
+        self.assertEqual(FeedValidator._sniff_root_tag(b"<feed xmlns='http://www.w3.org/2005/Atom'/>"),
+                         '{http://www.w3.org/2005/Atom}feed')
+        self.assertEqual(FeedValidator._sniff_root_tag(b'<!DOCTYPE html><html>'), 'html')
+        self.assertEqual(FeedValidator._sniff_root_tag(b'<feed>'), 'feed')
+
+    def test_undecided(self):
+        # Left to the parser
+        self.assertIsNone(FeedValidator._sniff_root_tag(RDF_FEED))
+        self.assertIsNone(FeedValidator._sniff_root_tag(b'<atom:feed xmlns:atom="http://www.w3.org/2005/Atom">'))
+        self.assertIsNone(FeedValidator._sniff_root_tag(b'<feed title="a>b" xmlns="http://www.w3.org/2005/Atom">'))
+        self.assertIsNone(FeedValidator._sniff_root_tag(b'<rss'))
+        self.assertIsNone(FeedValidator._sniff_root_tag('<rss>'.encode('utf-16')))
+        self.assertIsNone(FeedValidator._sniff_root_tag('<rss>'))
+
+    def test_agrees_with_parser(self):
+        samples = [b'<rss version="2.0">', ATOM_FEED, RDF_FEED, b'<html/>', b'<rss xmlns="urn:x">', b'  \n <rss\n>']
+        for sample in samples:
+            sniffed = FeedValidator._sniff_root_tag(sample)
+            if sniffed is not None:
+                parser = FeedValidator._pull_parser()
+                parser.feed(sample)
+                self.assertEqual(sniffed, next(iter(parser.read_events()))[1].tag)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,20 +1,65 @@
+import atexit
 import logging
 import requests
 from typing import Dict, Any
 from urllib3.util import Retry
 from requests.adapters import HTTPAdapter
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
+def _create_session() -> requests.Session:
+    # Configure retry strategy (3 retries with backoff)
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=0.5,  # 0.5s → 1s → 2s intervals
+        status_forcelist=[500, 502, 503, 504],  # Server errors
+        allowed_methods=["POST"]  # Only retry on POST requests
+    )
+
+    # Create HTTP adapter with retry configuration
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry_strategy)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers['X-Request-Source'] = 'IntelligenceHub'
+    if orjson:
+        # The body is encoded by orjson in common_post(), not by requests' json=
+        session.headers['Content-Type'] = 'application/json'
+    return session
+
+
+# Shared by all posts (and threads) so the keep-alive connections are reused instead of a new handshake per post
+_session = _create_session()
+atexit.register(_session.close)
+
+
+def _encode_body(data: Dict[str, Any]) -> Dict[str, Any]:
+    """The body argument of post(): orjson-encoded data, or json= for what orjson can't encode but json can."""
+    if orjson:
+        try:
+            return {'data': orjson.dumps(data)}
+        except TypeError:
+            # E.g. tuple subclasses like time.struct_time, non-str keys, ints over 64 bits
+            pass
+    return {'json': data}  # json= auto-sets Content-Type
+
+
 def common_post(url: str, data: Dict[str, Any], timeout: int = 10) -> Dict[str, Any]:
     """
     Send a JSON POST request with automatic retries and comprehensive error handling.
 
     Features:
-    - Automatic JSON serialization and Content-Type header
+    - Pooled keep-alive connections shared by all calls
+    - Automatic JSON serialization (orjson if installed) and Content-Type header
     - Connection and read timeouts
     - Retry mechanism for server errors (5xx) and connection issues
     - Detailed request logging with UUID tracking
@@ -26,50 +71,33 @@ def common_post(url: str, data: Dict[str, Any], timeout: int = 10) -> Dict[str,
     :param timeout: Total timeout in seconds (connection + read)
     :return: Response JSON or error dictionary
     """
-    # Configure retry strategy (3 retries with backoff)
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=0.5,  # 0.5s → 1s → 2s intervals
-        status_forcelist=[500, 502, 503, 504],  # Server errors
-        allowed_methods=["POST"]  # Only retry on POST requests
-    )
-
-    # Create HTTP adapter with retry configuration
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-
     # Extract UUID for logging before any errors occur
     request_uuid = data.get('UUID', 'UNKNOWN_UUID')
 
     try:
-        with requests.Session() as session:
-            # Mount retry adapter to session
-            session.mount("http://", adapter)
-            session.mount("https://", adapter)
-
-            # logger.info(f"Sending POST to {url} UUID={request_uuid}")
-
-            # Send request with separate connection/read timeouts
-            response = session.post(
-                url,
-                json=data,  # Auto-serializes to JSON + sets Content-Type
-                headers={'X-Request-Source': 'IntelligenceHub'},
-                timeout=(3, timeout - 3)  # 3s connection, remainder for read
-            )
-
-            # Validate HTTP status (raises exception for 4xx/5xx)
-            response.raise_for_status()
-
-            # Attempt JSON parsing (handles empty/invalid responses)
-            try:
-                json_response = response.json()
-                return json_response
-            except ValueError as json_err:
-                logger.error(f"JSON parse failed for {url} UUID={request_uuid}: {str(json_err)}")
-                return {
-                    "status": "error",
-                    "uuid": request_uuid,
-                    "reason": f"Invalid JSON response: {response.text[:100]}..."
-                }
+        # logger.info(f"Sending POST to {url} UUID={request_uuid}")
+
+        # Send request with separate connection/read timeouts
+        response = _session.post(
+            url,
+            **_encode_body(data),
+            timeout=(3, timeout - 3)  # 3s connection, remainder for read
+        )
+
+        # Validate HTTP status (raises exception for 4xx/5xx)
+        response.raise_for_status()
+
+        # Attempt JSON parsing (handles empty/invalid responses)
+        try:
+            json_response = response.json()
+            return json_response
+        except ValueError as json_err:
+            logger.error(f"JSON parse failed for {url} UUID={request_uuid}: {str(json_err)}")
+            return {
+                "status": "error",
+                "uuid": request_uuid,
+                "reason": f"Invalid JSON response: {response.text[:100]}..."
+            }
 
     except requests.exceptions.HTTPError as http_err:
         # Handle 4xx/5xx errors with response details
@@ -1,29 +1,83 @@
 import os
 import re
+import time
 import queue
 import hashlib
 import logging
 import sqlite3
+import weakref
 from pathlib import Path
-from datetime import datetime
 import tldextract
 import threading
 from typing import Tuple, Optional
 
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+_WWW_PREFIX_RE = re.compile(r'^www\d*\.')
+_UNDERSCORES_RE = re.compile(r'_+')
+_CATEGORY_TRANS = str.maketrans('', '', '\\/*?:"<>|')
+
+
+class _TitleTransTable(dict):
+    r"""str.translate() table that maps chars outside [a-zA-Z0-9\u4e00-\u9fa5\-_] to '_', filled on demand"""
+
+    def __missing__(self, code):
+        ch = chr(code)
+        keep = ('a' <= ch <= 'z' or 'A' <= ch <= 'Z' or '0' <= ch <= '9' or
+                '\u4e00' <= ch <= '\u9fa5' or ch == '-' or ch == '_')
+        self[code] = code if keep else '_'
+        return self[code]
+
+
+_TITLE_TRANS = _TitleTransTable()
+
+
+class _ThreadConnection:
+    """Holds a thread's connection in threading.local. It's dropped when the thread exits, which closes the connection."""
+
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _release_connection(conn: sqlite3.Connection, connections: set, lock: threading.Lock):
+    with lock:
+        connections.discard(conn)
+    conn.close()
+
+
+def _content_digest(data: bytes) -> str:
+    """128-bit content checksum. BLAKE3 when available, otherwise stdlib BLAKE2b."""
+    if blake3 is not None:
+        return blake3(data).hexdigest(length=16)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
 class _ContentHistoryManager:
     """Actual implementation class (private)"""
 
+    COMMIT_BATCH_SIZE = 50
+    URL_CACHE_SIZE = 50000
+    SQLITE_MAX_QUERY_PARAMS = 500
+
     def __init__(self, base_dir='content_storage', db_name='content_history.db'):
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self.db_path = os.path.join(base_dir, db_name)
-        self.operation_lock = threading.RLock()
-        self._url_map = {}
+        self.operation_lock = threading.Lock()
+        self._url_cache = {}        # Bounded LRU of url -> filepath already committed to db. Oldest use first.
+        self._pending = {}          # url -> filepath reserved by save_content() but not yet committed
+        self._local = threading.local()
+        self._connections = set()   # The open connections of the live threads
         self._init_db()
         self._init_components()
 
@@ -34,9 +88,36 @@ class _ContentHistoryManager:
         self.worker_thread.start()
 
     def _init_db(self):
-        with sqlite3.connect(self.db_path, timeout=10) as conn:
-            self._create_table(conn)
-            self._load_records(conn)
+        conn = self._get_conn()
+        self._create_table(conn)
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """
+        Lazily open one connection per thread so that readers never share a cursor with the writer.
+        The connection is closed when its thread exits, so short-lived crawl threads don't leak connections and fds.
+        """
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False, isolation_level=None)
+            self._configure_pragmas(conn)
+            holder = self._local.holder = _ThreadConnection(conn)
+            with self.operation_lock:
+                self._connections.add(conn)
+            weakref.finalize(holder, _release_connection, conn, self._connections, self.operation_lock)
+        return holder.conn
+
+    @staticmethod
+    def _configure_pragmas(conn):
+        """Use WAL so readers never block the writer and commits append to the log instead of syncing the db file"""
+        try:
+            cursor = conn.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute('PRAGMA busy_timeout=5000')
+            cursor.execute('PRAGMA temp_store=MEMORY')
+            cursor.execute('PRAGMA cache_size=-8000')
+        except Exception as e:
+            logger.error(f'Configure pragmas error: {str(e)}', stack_info=True)
 
     def _create_table(self, conn):
         """Create database table schema"""
@@ -54,61 +135,150 @@ class _ContentHistoryManager:
         except Exception as e:
             logger.error(f'Create table error: {str(e)}', stack_info=True)
 
-    def _load_records(self, conn):
+    def _cache_url(self, url, filepath):
+        """Must be called with operation_lock held"""
+        if len(self._url_cache) >= self.URL_CACHE_SIZE:
+            # Hits are moved to the end by _refresh_cached(), so the first entry is the least recently used.
+            del self._url_cache[next(iter(self._url_cache))]
+        self._url_cache[url] = filepath
+
+    def _refresh_cached(self, urls):
+        """Move the cached urls to the end of _url_cache, so the urls checked again and again are not evicted"""
+        with self.operation_lock:
+            for url in urls:
+                filepath = self._url_cache.pop(url, None)
+                if filepath is not None:
+                    self._url_cache[url] = filepath
+
+    def _lookup_filepath(self, url) -> Optional[str]:
+        # Single dict lookups are atomic under the GIL, no lock needed for reading.
+        if filepath := self._pending.get(url):
+            return filepath
+        if filepath := self._url_cache.get(url):
+            self._refresh_cached((url,))
+            return filepath
         try:
-            cursor = conn.cursor()
-            cursor.execute('SELECT url, filepath FROM content_history')
-            with self.operation_lock:
-                self._url_map = {row[0]: row[1] for row in cursor.fetchall()}
+            row = self._get_conn().execute(
+                'SELECT filepath FROM content_history WHERE url = ? LIMIT 1', (url,)).fetchone()
         except Exception as e:
-            logger.error(f'Load record error: {str(e)}', stack_info=True)
+            logger.error(f'Lookup url error: {str(e)}', stack_info=True)
+            return None
+        if row is None:
+            return None
+        with self.operation_lock:
+            self._cache_url(url, row[0])
+        return row[0]
+
+    def _select_existing(self, cursor, urls) -> set:
+        exists = set()
+        for i in range(0, len(urls), self.SQLITE_MAX_QUERY_PARAMS):
+            chunk = urls[i:i + self.SQLITE_MAX_QUERY_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'SELECT url FROM content_history WHERE url IN ({placeholders})', chunk)
+            exists.update(row[0] for row in cursor)
+        return exists
 
     def _async_worker(self):
+        conn = self._get_conn()
+        cursor = conn.cursor()      # Reused for every batch of this writer thread
         while not self.stop_event.is_set():
             try:
-                task = self.task_queue.get(timeout=2)
-                with sqlite3.connect(self.db_path, timeout=10) as conn:
-                    self._process_task(task, conn)
+                tasks = [self.task_queue.get(timeout=2)]
             except queue.Empty:
                 continue
+            # Drain whatever is already queued so that one commit covers the whole batch.
+            while len(tasks) < self.COMMIT_BATCH_SIZE:
+                try:
+                    tasks.append(self.task_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._process_tasks(tasks, conn, cursor)
             except Exception as e:
                 logger.error(f"Worker error: {e}")
+                with self.operation_lock:
+                    for task in tasks:
+                        self._pending.pop(task[0], None)
+
+    def _process_tasks(self, tasks, conn, cursor):
+        # This is the only writer, so urls absent now are still absent when the batch commits.
+        skip_urls = self._select_existing(cursor, [task[0] for task in tasks])
+
+        rows = []
+        written = []
+        for url, content, filepath in tasks:
+            if url in skip_urls:
+                continue
+            skip_urls.add(url)
+            temp_path = filepath.with_name(filepath.name + '.tmp')  # 临时文件, 提交后原子替换为正式文件
+            try:
+                # Encoding and hashing run here so crawler threads return right after enqueue.
+                data = content.encode('utf-8')
+                checksum = _content_digest(data)
+                temp_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(temp_path, 'xb') as f:
+                    f.write(data)
+                rows.append((url, str(filepath), checksum))
+                written.append((url, filepath, temp_path))
+            except Exception as e:
+                temp_path.unlink(missing_ok=True)
+                logger.error(f"Task failed (URL: {url}): {e}", exc_info=True)
 
-    def _process_task(self, task, conn):
-        url, content, title, category, suffix, filepath = task
-        temp_path = filepath.with_suffix('.tmp')  # 临时文件
-        try:
-            temp_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+        if rows:
+            try:
+                cursor.execute('BEGIN IMMEDIATE')
+                cursor.executemany('INSERT OR IGNORE INTO content_history (url, filepath, checksum) VALUES (?, ?, ?)',
+                                   rows)
+                conn.commit()
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                for _, _, temp_path in written:
+                    temp_path.unlink(missing_ok=True)
+                logger.error(f"Commit batch of {len(rows)} tasks failed: {e}", exc_info=True)
+                written = []
+
+        for url, filepath, temp_path in written:
+            try:
+                os.replace(temp_path, filepath)
+            except Exception as e:
+                logger.error(f"Rename failed (URL: {url}): {e}", exc_info=True)
 
-            checksum = hashlib.sha256(content.encode()).hexdigest()
-            cursor = conn.cursor()
-            cursor.execute('INSERT OR IGNORE INTO content_history (url, filepath, checksum) VALUES (?, ?, ?)',
-                           (url, str(filepath), checksum))
-            if cursor.rowcount == 0:
-                temp_path.unlink()
-                return
-            conn.commit()
-            temp_path.rename(filepath)
-            with self.operation_lock:
-                self._url_map[url] = str(filepath)
-        except Exception as e:
-            if temp_path.exists():
-                temp_path.unlink()
-            logger.error(f"Task failed (URL: {url}): {e}", exc_info=True)
+        # Publish to cache before dropping the reservation so lock-free readers never miss a url.
+        with self.operation_lock:
+            for url, filepath, _ in written:
+                self._cache_url(url, str(filepath))
+            for task in tasks:
+                self._pending.pop(task[0], None)
 
     def save_content(self, url, content, title, category, suffix='.txt'):
-        filepath = ''
+        exists_path = self._lookup_filepath(url)
+        if exists_path:
+            return True, exists_path
+
+        filepath = self._generate_filepath(title, url, category, suffix)
+
+        # Only the reservation is guarded. File writing and hashing happen in the worker without the lock.
+        with self.operation_lock:
+            exists_path = self._pending.get(url)
+            if exists_path:
+                return True, exists_path
+            self._pending[url] = str(filepath)
+
         try:
-            filepath = self.generate_filepath(title, content, url, category, suffix)
-            self.task_queue.put((url, content, title, category, suffix, filepath), block=True, timeout=5)
+            self.task_queue.put((url, content, filepath), block=True, timeout=5)
             return True, filepath
         except queue.Full:
+            with self.operation_lock:
+                self._pending.pop(url, None)
             logger.warning("Queue full, retrying...")
             return False, filepath
 
     def generate_filepath(self, title, content, url, category, suffix):
+        # The name is keyed by url, content is kept for interface compatibility.
+        return self._generate_filepath(title, url, category, suffix)
+
+    def _generate_filepath(self, title, url, category, suffix):
         # 提取域名并处理多级结构
         extracted = tldextract.extract(url)
         domain_parts = []
@@ -118,58 +288,88 @@ class _ContentHistoryManager:
         combined = '.'.join(domain_parts)
 
         # 处理特殊前缀和多级结构
-        combined = re.sub(r'^www\d*\.', '', combined)  # 移除www前缀
-        category_part = re.sub(r'[\\/*?:"<>|]', '', combined.replace('.', '_'))  # 转换特殊字符
+        combined = _WWW_PREFIX_RE.sub('', combined)  # 移除www前缀
+        category_part = combined.replace('.', '_').translate(_CATEGORY_TRANS)  # 转换特殊字符
 
         # 原逻辑增强
-        clean_category = re.sub(r'[\\/*?:"<>|]', '', category.strip())
-        clean_title = re.sub(r'[^a-zA-Z0-9\u4e00-\u9fa5\-_]', '_', title.strip())[:50]
-        clean_title = re.sub(r'_+', '_', clean_title)
-
-        content_hash = hashlib.md5(content.encode()).hexdigest()[:6]
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        base_name = f"{clean_title}_{content_hash}_{timestamp}{suffix}"
+        clean_category = category.strip().translate(_CATEGORY_TRANS)
+        clean_title = title.strip()[:50].translate(_TITLE_TRANS)
+        clean_title = _UNDERSCORES_RE.sub('_', clean_title)
+
+        # The url is the primary key, so its short hash distinguishes files as well as a content hash
+        # and leaves the content hashing to the worker thread.
+        url_hash = hashlib.blake2b(url.encode('utf-8'), digest_size=3).hexdigest()
+        # Hash + microsecond timestamp is unique enough, no need to stat the disk for conflicts.
+        secs, ns = divmod(time.time_ns(), 1_000_000_000)
+        timestamp = f'{time.strftime("%Y%m%d-%H%M%S", time.localtime(secs))}-{ns // 1000:06d}'
+        base_name = f"{clean_title}_{url_hash}_{timestamp}{suffix}"
 
         # 构建新路径结构
-        base_path = self.base_dir / category_part / clean_category / base_name  # 新增域名层级
-
-        if not base_path.exists():
-            return base_path
-
-        timestamp_ms = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
-        return self.base_dir / category_part / clean_category / f"{clean_title}_{content_hash}_{timestamp_ms}{suffix}"
+        return self.base_dir / category_part / clean_category / base_name  # 新增域名层级
 
     def has_url(self, url):
         """Check URL existence"""
-        with self.operation_lock:
-            return url in self._url_map
+        return self._lookup_filepath(url) is not None
+
+    def existing_urls(self, urls) -> set:
+        """Check a batch of URLs with one query per SQLITE_MAX_QUERY_PARAMS chunk instead of one query per URL"""
+        exists = set()
+        cached = []
+        missing = []
+        for url in urls:
+            if url in self._pending:
+                exists.add(url)
+            elif url in self._url_cache:
+                cached.append(url)
+            else:
+                missing.append(url)
+        if cached:
+            self._refresh_cached(cached)
+            exists.update(cached)
+        try:
+            exists |= self._select_existing(self._get_conn().cursor(), missing)
+        except Exception as e:
+            logger.error(f'Lookup urls error: {str(e)}', stack_info=True)
+        return exists
 
     def get_filepath(self, url):
         """Get stored file path"""
-        with self.operation_lock:
-            return self._url_map.get(url)
+        return self._lookup_filepath(url)
 
     def export_mappings(self, export_path, format='csv'):
         """Export URL-file mappings"""
-        with self.operation_lock:
-            items = list(self._url_map.items())
-
-            if format == 'csv':
-                import csv
-                with open(export_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['URL', 'Filepath'])
-                    writer.writerows(items)
-            elif format == 'json':
-                import json
-                with open(export_path, 'w', encoding='utf-8') as f:
-                    json.dump(dict(items), f, indent=2)
-            else:
-                raise ValueError("Unsupported format")
+        if format not in ('csv', 'json'):
+            raise ValueError("Unsupported format")
+
+        # Stream rows straight from the cursor so memory stays constant whatever the history size.
+        # Under WAL this read does not block the writer.
+        cursor = self._get_conn().execute('SELECT url, filepath FROM content_history')
+
+        if format == 'csv':
+            import csv
+            with open(export_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['URL', 'Filepath'])
+                writer.writerows(cursor)
+        else:
+            import json
+            with open(export_path, 'w', encoding='utf-8') as f:
+                # Same layout as json.dump(..., indent=2)
+                separator = '\n  '
+                f.write('{')
+                for url, filepath in cursor:
+                    f.write(f'{separator}{json.dumps(url)}: {json.dumps(filepath)}')
+                    separator = ',\n  '
+                f.write('}' if separator == '\n  ' else '\n}')
 
     def shutdown(self):
         self.stop_event.set()
         self.worker_thread.join()
+        with self.operation_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
 
 
 _instance: Optional[_ContentHistoryManager] = None
@@ -192,6 +392,10 @@ def has_url(url):
     return _get_instance().has_url(url)
 
 
+def existing_urls(urls) -> set:
+    return _get_instance().existing_urls(urls)
+
+
 def get_base_dir() -> Path:
     return _get_instance().base_dir
 
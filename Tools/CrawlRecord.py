@@ -98,13 +98,13 @@ class CrawlRecord:
                 LIMIT ?
             ''', (self.cache_size,))
 
-            for row in cursor.fetchall():
-                url = row[1]
+            # Iterate the cursor directly, no intermediate list from fetchall().
+            for row_id, url, status, error_count, extra_info in cursor:
                 self.memory_cache[url] = {
-                    'id': row[0],
-                    'status': row[2],
-                    'error_count': row[3],
-                    'extra_info': row[4]
+                    'id': row_id,
+                    'status': status,
+                    'error_count': error_count,
+                    'extra_info': extra_info
                 }
 
         except sqlite3.Error as e:
@@ -38,7 +38,7 @@ class RequestTracer:
         g.request_id = request_id
 
         request_info = {
-            'start_time': time.time(),
+            'start_time': time.monotonic(),
             'path': request.path,
             'method': request.method,
             'ip': request.remote_addr,
@@ -59,24 +59,23 @@ class RequestTracer:
             request_info = self._pending_requests.pop(request_id, None)
 
         if request_info:
-            duration = time.time() - request_info['start_time']
+            duration = time.monotonic() - request_info['start_time']
 
-            log_message = (
-                f"Request finished: {duration:.4f}s | {request_info['method']} {request_info['path']} "
-                f"| IP: {request_info['ip']}"
-            )
+            # Every request passes here. Let logging format the message only when the record is really emitted.
+            log_format = "Request finished: %.4fs | %s %s | IP: %s"
+            log_args = (duration, request_info['method'], request_info['path'], request_info['ip'])
 
             # 如果超过阈值，打印 Warning
             if duration > self.threshold:
-                logger.warning(f"SLOW REQUEST! {log_message}")
+                logger.warning("SLOW REQUEST! " + log_format, *log_args)
             else:
-                logger.info(log_message)
+                logger.info(log_format, *log_args)
 
         return response
 
     def dump_long_running_requests(self):
         """Requirement 3: 检查并报告卡住或运行时间极长的请求。"""
-        now = time.time()
+        now = time.monotonic()
 
         # 定义极长和超长阈值
         long_threshold = self.threshold * 10
@@ -23,7 +23,10 @@ class VectorStoreManager:
             collection_name: str,
             embedding_model: "SentenceTransformer",
             chunk_size: int = 512,
-            chunk_overlap: int = 50
+            chunk_overlap: int = 50,
+            hnsw_m: int = 32,
+            hnsw_construction_ef: int = 40,
+            hnsw_search_ef: int = 16
     ):
         """
         Initializes the VectorStoreManager.
@@ -36,6 +39,10 @@ class VectorStoreManager:
                                                   SentenceTransformer model.
             chunk_size (int): The target size for text chunks (in characters).
             chunk_overlap (int): The overlap between consecutive chunks.
+            hnsw_m (int): The max number of neighbours of a node in the HNSW graph.
+            hnsw_construction_ef (int): The candidate list size when inserting. Larger is more accurate but slower.
+            hnsw_search_ef (int): The candidate list size when searching. Larger is more accurate but slower.
+                                  The HNSW parameters only take effect when the collection is created.
         """
         from langchain_text_splitters import RecursiveCharacterTextSplitter
 
@@ -44,9 +51,15 @@ class VectorStoreManager:
 
         # Get or create the collection with cosine similarity,
         # which is standard for sentence-transformers.
+        # Chroma indexes it with HNSW, so a query is sub-linear instead of a scan of all chunks.
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"}  # Use cosine similarity
+            metadata={
+                "hnsw:space": "cosine",  # Use cosine similarity
+                "hnsw:M": hnsw_m,
+                "hnsw:construction_ef": hnsw_construction_ef,
+                "hnsw:search_ef": hnsw_search_ef,
+            }
         )
 
         # (Requirement 3) Initialize the text splitter
@@ -67,9 +80,10 @@ class VectorStoreManager:
             text (Union[str, List[str]]): The text or texts to vectorize.
 
         Returns:
-            np.ndarray: The resulting embedding(s).
+            np.ndarray: The resulting embedding(s), normalized to unit length.
         """
-        return self.model.encode(text)
+        # Unit vectors make the cosine distance a plain dot product. The model normalizes the whole batch at once.
+        return self.model.encode(text, normalize_embeddings=True)
 
     # --- Requirement 1 & 3: Add Document with Chunking ---
     def add_document(self, text: str, doc_id: str) -> List[str]:
@@ -86,35 +100,63 @@ class VectorStoreManager:
             List[str]: A list of the vector database index IDs (chunk_ids)
                        created for this document.
         """
-        # (Requirement 3) Automatically split text into chunks
-        chunks = self.text_splitter.split_text(text)
+        return self.add_documents([text], [doc_id]).get(doc_id, [])
 
-        if not chunks:
-            print(f"Warning: Document {doc_id} produced no chunks.")
-            return []
+    def add_documents(self, texts: List[str], doc_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        Adds a batch of documents to the vector store.
+        The chunks of all documents are vectorized by one model call and saved
+        by one collection call, which is much faster than adding them one by one.
 
-        # (Requirement 3) Create unique IDs and metadata for each chunk
-        chunk_ids = [f"{doc_id}#chunk_{i}" for i in range(len(chunks))]
-        metadatas = [
-            {"original_doc_id": doc_id, "chunk_index": i, "total_chunks": len(chunks)}
-            for i in range(len(chunks))
-        ]
+        Args:
+            texts (List[str]): The full texts of the documents.
+            doc_ids (List[str]): The unique identifiers of the documents, in the same order.
 
-        # (Requirement 8) Decoupled vectorization
-        embeddings = self.vectorize_text(chunks).tolist()
+        Returns:
+            Dict[str, List[str]]: doc_id -> the chunk_ids created for it.
+                                  Empty if the batch failed to be saved.
+        """
+        all_chunks = []
+        all_chunk_ids = []
+        all_metadatas = []
+        doc_chunk_ids = {}
+
+        for text, doc_id in zip(texts, doc_ids):
+            # (Requirement 3) Automatically split text into chunks
+            chunks = self.text_splitter.split_text(text)
+
+            if not chunks:
+                print(f"Warning: Document {doc_id} produced no chunks.")
+                continue
+
+            # (Requirement 3) Create unique IDs and metadata for each chunk
+            chunk_ids = [f"{doc_id}#chunk_{i}" for i in range(len(chunks))]
+            all_metadatas.extend(
+                {"original_doc_id": doc_id, "chunk_index": i, "total_chunks": len(chunks)}
+                for i in range(len(chunks))
+            )
+            all_chunks.extend(chunks)
+            all_chunk_ids.extend(chunk_ids)
+            doc_chunk_ids[doc_id] = chunk_ids
+
+        if not all_chunks:
+            return {}
+
+        # (Requirement 8) Decoupled vectorization. The model encodes the chunks in mini-batches.
+        embeddings = self.vectorize_text(all_chunks).tolist()
 
         # (Requirement 1) Save to vector database
         try:
             self.collection.add(
                 embeddings=embeddings,
-                documents=chunks,
-                metadatas=metadatas,
-                ids=chunk_ids
+                documents=all_chunks,
+                metadatas=all_metadatas,
+                ids=all_chunk_ids
             )
-            return chunk_ids
+            return doc_chunk_ids
         except Exception as e:
-            print(f"Error adding document {doc_id}: {e}")
-            return []
+            print(f"Error adding documents {list(doc_chunk_ids)}: {e}")
+            return {}
 
     # --- Requirement 4 & 5: Search with Filtering ---
     def search(
@@ -339,7 +381,9 @@ class ThreadedVectorStore:
             collection_name: str,
             model_name: str,
             chunk_size: int = 512,
-            chunk_overlap: int = 50
+            chunk_overlap: int = 50,
+            device: Optional[str] = None,
+            half_precision: bool = False
     ):
         """
         Starts the non-blocking initialization.
@@ -350,6 +394,10 @@ class ThreadedVectorStore:
             model_name (str): Name of the sentence-transformer model.
             chunk_size (int): Target chunk size.
             chunk_overlap (int): Chunk overlap.
+            device (str): The device to run the model on, like 'cuda', 'cuda:1' or 'cpu'.
+                          None to use a GPU if there is one.
+            half_precision (bool): Run the model in FP16 when it's on a GPU. Halves its memory and
+                                   speeds up encoding, the stored embeddings stay float32.
         """
         self._store: Optional[VectorStoreManager] = None
         self._status: str = "initializing"  # States: initializing, ready, error
@@ -357,7 +405,7 @@ class ThreadedVectorStore:
 
         # Store params for the background thread
         self._init_params = (
-            db_path, collection_name, model_name, chunk_size, chunk_overlap
+            db_path, collection_name, model_name, chunk_size, chunk_overlap, device, half_precision
         )
 
         # (Requirement 1) Start initialization in a background thread
@@ -371,7 +419,7 @@ class ThreadedVectorStore:
         """
         try:
             (db_path, collection_name, model_name,
-             chunk_size, chunk_overlap) = self._init_params
+             chunk_size, chunk_overlap, device, half_precision) = self._init_params
 
             print(f"[{collection_name} BG]: Importing heavy libraries...")
             import chromadb
@@ -383,8 +431,11 @@ class ThreadedVectorStore:
             client = chromadb.PersistentClient(path=db_path)
             print(f"[ThreadedStore BG]: ChromaDB client loaded.")
 
-            model = SentenceTransformer(model_name)
-            print(f"[ThreadedStore BG]: SentenceTransformer model loaded.")
+            # Embedding is the heavy part of adding and searching. It runs on the GPU when there is one.
+            model = SentenceTransformer(model_name, device=device)
+            if half_precision and model.device.type == 'cuda':
+                model.half()
+            print(f"[ThreadedStore BG]: SentenceTransformer model loaded on {model.device}.")
             # --- End of SLOW part ---
 
             self._store = VectorStoreManager(
@@ -1,15 +1,15 @@
-import time
 import logging
 import urllib3
 import threading
 from uuid import uuid4
-from typing import Callable, TypedDict, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, TypedDict, List, Mapping, Optional, Tuple
 
 from GlobalConfig import DEFAULT_COLLECTOR_TOKEN
 from IntelligenceHub import CollectedData
 from MyPythonUtility.easy_config import EasyConfig
-from PyLoggingBackend.LogUtility import get_tls_logger
-from Tools.ContentHistory import has_url
+from PyLoggingBackend.LogUtility import get_tls_logger, set_tls_logger
+from Tools.ContentHistory import existing_urls
 from IntelligenceHubWebService import post_collected_intelligence, DEFAULT_IHUB_PORT
 from Streamer.ToFileAndHistory import to_file_and_history
 from Tools.CrawlRecord import CrawlRecord, STATUS_ERROR, STATUS_SUCCESS, STATUS_DB_ERROR, STATUS_UNKNOWN, STATUS_IGNORED
@@ -25,6 +25,18 @@ logger.setLevel(logging.INFO)
 
 CRAWL_ERROR_THRESHOLD = 3
 
+
+def create_feed_executor(feed_workers: int, flow_name: str) -> ThreadPoolExecutor:
+    """
+    Create the executor that processes the feeds. Its threads log to the TLS logger of the calling thread
+    (the plugin's logger set by ServiceEngine), not to the default one.
+    """
+    # set_tls_logger() returns the logger it replaces. Put it straight back.
+    tls_logger = set_tls_logger(None)
+    set_tls_logger(tls_logger)
+    return ThreadPoolExecutor(max_workers=max(1, feed_workers), thread_name_prefix=flow_name,
+                              initializer=set_tls_logger, initargs=(tls_logger,))
+
 CRAWL_ERROR_FEED_FETCH = 'Feed fetch error'
 CRAWL_ERROR_FEED_PARSE = 'Feed parse error'
 CRAWL_ERROR_ARTICLE_FETCH = 'Article fetch error'
@@ -100,14 +112,17 @@ def fetch_process_article(article_link: str,
 # ---------------------------------- Main process ----------------------------------
 
 def feeds_craw_flow(flow_name: str,
-                    feeds: Dict[str, str],
+                    feeds: Mapping[str, str],
                     stop_event: threading.Event,
                     config: EasyConfig,
                     update_interval_s: int,
 
                     fetch_feed: Callable[[str], FeedData],
                     fetch_content: Callable[[str], FetchContentResult],
-                    scrubbers: List[Callable[[str], str]]):
+                    scrubbers: List[Callable[[str], str]],
+                    feed_workers: int = 4,
+                    crawl_record: Optional[CrawlRecord] = None,
+                    executor: Optional[ThreadPoolExecutor] = None):
     """
     A common feeds and their articles craw workflow. This workflow works in this sequence:
         fetch_feed -> for each feed: fetch_content -> apply scrubbers
@@ -127,6 +142,11 @@ def feeds_craw_flow(flow_name: str,
                         fetch_content(article_link: str) -> dict
     :param scrubbers: The functions to process scrubbed text. Function declaration:
                         scrubber(text: str) -> str
+    :param feed_workers: The max number of feeds processed in parallel. Not used if executor is given.
+    :param crawl_record: The CrawlRecord kept by the caller across loops.
+                        If None, a CrawlRecord of this flow is opened (and its cache loaded) for this loop.
+    :param executor: The executor kept by the caller across loops to process the feeds. It's not shut down here.
+                        If None, an executor of feed_workers threads is created for this loop.
 
     :return: None
     """
@@ -139,14 +159,15 @@ def feeds_craw_flow(flow_name: str,
 
     logger.info(f'{prefix} submit to URL: {submit_ihub_url}, token = {token}.')
 
-    crawl_record = CrawlRecord(['crawl_record', flow_name])
+    if crawl_record is None:
+        crawl_record = CrawlRecord(['crawl_record', flow_name])
     crawl_statistics = CrawlStatistics()
 
     # ------------------------------------------------------------------------------------------------------------------
 
-    for feed_name, feed_url in feeds.items():
+    def process_feed(feed_name: str, feed_url: str):
         if stop_event.is_set():
-            break
+            return
         stat_name = [flow_name, feed_url]
 
         feed_statistics = {
@@ -170,13 +191,18 @@ def feeds_craw_flow(flow_name: str,
             logger.error(f"{prefix} Process feed fail: {feed_url} - {str(e)}")
             crawl_record.increment_error_count(feed_url)
             crawl_statistics.counter_log(stat_name, 'exception')
-            continue
+            return
 
         logger.info(f'{prefix} Feed: [{feed_name}] process finished.')
 
+        # One batched lookup for the whole feed instead of a history query per article.
+        history_urls = existing_urls([article.link for article in result.entries])
+
         # ----------------------------------- Process Articles in Feed ----------------------------------
 
         for article in result.entries:
+            if stop_event.is_set():
+                break
             try:
                 feed_statistics['index'] += 1
                 article_link = article.link
@@ -202,7 +228,7 @@ def feeds_craw_flow(flow_name: str,
                     raise ProcessProblem('db_error', article_link)
 
                 # Also keep this check to make it compatible
-                if has_url(article_link):
+                if article_link in history_urls:
                     raise ProcessSkip('already exists', article_link)
 
                 # ------------------------------- Fetch and Parse articles ------------------------------
@@ -306,6 +332,25 @@ def feeds_craw_flow(flow_name: str,
         # print('=' * 100)
         # print()
 
+    # Feeds are I/O bound and independent from each other, so process them in parallel.
+    loop_executor = None
+    if executor is None:
+        executor = loop_executor = create_feed_executor(min(feed_workers, len(feeds)), flow_name)
+    try:
+        futures = [executor.submit(process_feed, feed_name, feed_url) for feed_name, feed_url in feeds.items()]
+        for future in as_completed(futures):
+            if stop_event.is_set():
+                for f in futures:
+                    f.cancel()
+                break
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"{prefix} Process feed crashed: {str(e)}", exc_info=True)
+    finally:
+        if loop_executor:
+            loop_executor.shutdown(wait=True)
+
     # ----------------------------------------- Log all feeds counter -----------------------------------------
 
     crawl_statistics.dump_counters(['flow_name'])
@@ -313,9 +358,5 @@ def feeds_craw_flow(flow_name: str,
 
     # ------------------------------------------ Delay and Wait for Next Loop ------------------------------------------
 
-    # Wait for next loop and check event per 5s.
-    remaining = update_interval_s
-    while remaining > 0 and not stop_event.is_set():
-        sleep_time = min(5, remaining)
-        time.sleep(sleep_time)
-        remaining -= sleep_time
+    # Wait for next loop. Returns as soon as stop_event is set.
+    stop_event.wait(update_interval_s)
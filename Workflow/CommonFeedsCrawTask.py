@@ -0,0 +1,118 @@
+import importlib
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Mapping, Optional, Union
+
+from MyPythonUtility.easy_config import EasyConfig
+from ServiceEngine import ServiceContext
+from Tools.RSSFetcher import fetch_feed
+from Tools.CrawlRecord import CrawlRecord
+from Scrubber.HTMLConvertor import html_content_converter
+from Scrubber.UnicodeSanitizer import sanitize_unicode_string
+from Workflow.CommonFeedsCrawFlow import feeds_craw_flow, create_feed_executor
+
+
+# The feeds of a task processed in parallel by default.
+# A Playwright scraper launches a browser per fetch, so those tasks process one feed at a time unless told otherwise.
+DEFAULT_FEED_WORKERS = 4
+PLAYWRIGHT_FEED_WORKERS = 1
+
+
+class FeedsCrawTask:
+    """
+    The common implementation of feeds crawl task plugins. A task plugin declares its feeds and scrape parameters
+    with an instance of this class, then forwards its module_init() and start_task() to the instance.
+
+    Scrapers are specified by module name and imported in module_init(),
+    so the heavy Playwright scrapers are only loaded by the tasks that really use them.
+
+    The feeds are processed by an executor created in module_init() and reused by every crawl loop,
+    so a loop doesn't start new threads (each with its own ContentHistory connection).
+    """
+
+    __slots__ = ('flow_name', 'feeds', 'feed_scraper', 'content_scraper', 'timeout_ms', 'selectors', 'max_length',
+                 'content_format', 'update_interval_s', 'config', 'feed_fetcher', 'content_fetcher', 'scrubbers',
+                 'crawl_record', 'feed_workers', 'executor')
+
+    def __init__(self,
+                 flow_name: str,
+                 feeds: Mapping[str, str],
+                 *,
+                 feed_scraper: str,
+                 content_scraper: str,
+                 timeout_ms: int,
+                 selectors: Union[str, List[str]],
+                 max_length: int,
+                 content_format: Optional[str] = None,
+                 update_interval_s: int = 15 * 60,
+                 feed_workers: Optional[int] = None):
+        """
+        :param flow_name: The workflow name for logging and tracing.
+        :param feeds: The feeds dict like: { 'feed name': 'feed link' }
+        :param feed_scraper: The module name of the scraper that fetches feeds. E.g. 'Scraper.RequestsScraper'
+        :param content_scraper: The module name of the scraper whose fetch_content() fetches articles.
+        :param timeout_ms: The article fetching timeout in ms.
+        :param selectors: The CSS selectors of article content for html_content_converter.
+        :param max_length: The max article text length for sanitize_unicode_string.
+        :param content_format: The 'format' argument of fetch_content(). Not passed if None.
+        :param update_interval_s: The polling update interval in second.
+        :param feed_workers: The max number of feeds processed in parallel. If None, PLAYWRIGHT_FEED_WORKERS when
+                                either scraper is a Playwright one, otherwise DEFAULT_FEED_WORKERS.
+        """
+        self.flow_name = flow_name
+        self.feeds = feeds
+        self.feed_scraper = feed_scraper
+        self.content_scraper = content_scraper
+        self.timeout_ms = timeout_ms
+        self.selectors = selectors
+        self.max_length = max_length
+        self.content_format = content_format
+        self.update_interval_s = update_interval_s
+        if feed_workers is None:
+            uses_playwright = 'Playwright' in feed_scraper or 'Playwright' in content_scraper
+            feed_workers = PLAYWRIGHT_FEED_WORKERS if uses_playwright else DEFAULT_FEED_WORKERS
+        self.feed_workers = max(1, min(feed_workers, len(feeds)))
+
+        self.config: EasyConfig | None = None
+        self.feed_fetcher = None
+        self.content_fetcher = None
+        self.scrubbers = []
+        self.crawl_record: CrawlRecord | None = None
+        self.executor: ThreadPoolExecutor | None = None
+
+    def module_init(self, service_context: ServiceContext):
+        self.config = service_context.config
+
+        proxy = self.config.get('collector.global_site_proxy', {})
+        content_kwargs = {'format': self.content_format} if self.content_format else {}
+
+        self.feed_fetcher = partial(fetch_feed, scraper=importlib.import_module(self.feed_scraper), proxy=proxy)
+        self.content_fetcher = partial(importlib.import_module(self.content_scraper).fetch_content,
+                                       timeout_ms=self.timeout_ms, proxy=proxy, **content_kwargs)
+        self.scrubbers = [
+            partial(html_content_converter, selectors=self.selectors),
+            partial(sanitize_unicode_string, max_length=self.max_length)
+        ]
+        # start_task() is called in a loop. Open the record DB and load its cache once instead of every loop.
+        self.crawl_record = CrawlRecord(['crawl_record', self.flow_name])
+
+        if self.executor:
+            self.executor.shutdown(wait=False)
+        self.executor = create_feed_executor(self.feed_workers, self.flow_name)
+
+    def start_task(self, stop_event):
+        feeds_craw_flow(self.flow_name,
+                        self.feeds,
+                        stop_event,
+                        self.config,
+                        self.update_interval_s,
+
+                        self.feed_fetcher,
+                        self.content_fetcher,
+                        self.scrubbers,
+                        crawl_record=self.crawl_record,
+                        executor=self.executor)
+
+        # The task is being stopped (or unloaded). Let the feed threads go. module_init() creates a new executor.
+        if stop_event.is_set():
+            self.executor.shutdown(wait=False, cancel_futures=True)